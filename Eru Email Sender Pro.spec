@@ -6,7 +6,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('EMAIL.ico', '.')],
+    datas=[('EMAIL.ico', '.'), ('styles.qss', '.')],
     hiddenimports=['secrets', 'uuid', 'hashlib', 'hmac', 'base64', 'json'],
     hookspath=[],
     hooksconfig={},
@@ -3,28 +3,50 @@ import os
 import time
 import re
 import json
+import string
+import functools
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
+import numpy as np
 import pandas as pd
 import win32com.client
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font
+from openpyxl.cell import WriteOnlyCell
+
+try:
+    import orjson  # Optional: faster settings load/save
+except ImportError:
+    orjson = None
 
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QFileDialog, QTableWidget, QTableWidgetItem,
+    QPushButton, QFileDialog, QTableView,
     QProgressBar, QTextEdit, QMessageBox, QSplitter,
     QLineEdit, QToolBar, QLabel, QFrame, QScrollArea,
     QGroupBox, QSizePolicy, QSpacerItem, QHeaderView, QComboBox,
     QTabWidget
 )
-from PySide6.QtGui import QFont, QAction, QIcon, QPalette, QColor, QPixmap, QTextCursor, QTextBlockFormat, QKeySequence
-from PySide6.QtCore import Qt, QThread, Signal, QSize
+from PySide6.QtGui import QFont, QAction, QIcon, QPalette, QColor, QPixmap, QTextCursor, QTextBlockFormat, QKeySequence, QTextDocument, QStandardItemModel, QStandardItem
+from PySide6.QtCore import Qt, QThread, Signal, QTimer, QAbstractTableModel, QModelIndex, QSignalBlocker
 
 # =====================================================
 # SETTINGS MANAGER
 # =====================================================
+# Keys shared by the settings file and the template code. Identifier-like
+# literals are interned at compile time, so lookups stay on the identity path
+_SK_SPACING = "paragraph_spacing"
+_SK_TEMPLATES = "email_templates"
+_SK_LAST_TEMPLATE = "last_selected_template"
+_DEFAULT_TEMPLATE_KEY = "default"
+_TPL_SUBJECT = "subject"
+_TPL_BODY = "body"
+
 class SettingsManager:
+    SAVE_DELAY_MS = 500  # Quiet period after the last set() before writing
+
     def __init__(self, config_file="settings.json"):
         # Handle both script and executable environments
         if getattr(sys, 'frozen', False):
@@ -39,21 +61,29 @@ class SettingsManager:
             self.config_file = os.path.join(script_dir, config_file)
         self.default_settings = {
             "window_geometry": None,
-            "paragraph_spacing": 12,
-            "email_templates": {},
+            _SK_SPACING: 12,
+            _SK_TEMPLATES: {},
             "last_excel_path": "",
             "auto_save_interval": 5,
             "retry_failed_emails": True,
             "max_retries": 3,
-            "last_selected_template": "default"
+            _SK_LAST_TEMPLATE: _DEFAULT_TEMPLATE_KEY
         }
         self.settings = self.load_settings()
+        self._save_pending = False
+        self._last_written = None  # Bytes of the last successful save
+        # Restarted by every set(), so a burst of changes is written once
+        self._save_timer = QTimer()
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.flush)
     
     def load_settings(self):
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    loaded_settings = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    data = f.read()
+                    loaded_settings = orjson.loads(data) if orjson else json.loads(data.decode('utf-8'))
                     # Merge with defaults to handle missing keys
                     settings = self.default_settings.copy()
                     settings.update(loaded_settings)
@@ -65,18 +95,56 @@ class SettingsManager:
     
     def save_settings(self):
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=2, ensure_ascii=False)
+            if orjson:
+                data = orjson.dumps(self.settings, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                data = json.dumps(self.settings, indent=2, ensure_ascii=False).encode('utf-8')
+            if data == self._last_written:
+                return True  # Nothing changed since the last write
+            # Write to a temp file and swap it in so a crash never leaves a truncated file
+            tmp_file = self.config_file + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, self.config_file)
+            self._last_written = data
             return True
         except Exception:
             return False
     
+    def flush(self):
+        """Write pending changes to disk immediately"""
+        self._save_timer.stop()
+        if not self._save_pending:
+            return True
+        self._save_pending = False
+        return self.save_settings()
+    
     def get(self, key, default=None):
         return self.settings.get(key, default)
     
     def set(self, key, value):
+        # Skip unchanged values; the same object may have been mutated in place,
+        # so only an equal copy counts as unchanged
+        current = self.settings.get(key)
+        if key in self.settings and current is not value and current == value:
+            return
         self.settings[key] = value
-        self.save_settings()
+        # Mark dirty and defer the write so rapid UI changes are saved together
+        self._save_pending = True
+        self._save_timer.start()
+
+# =====================================================
+# RESOURCE PATHS
+# =====================================================
+def _resolve_resource_path(filename):
+    """Return the path of a bundled file for both script and executable environments"""
+    if getattr(sys, 'frozen', False):
+        # PyInstaller extracts bundled files to _MEIPASS; else use the executable's directory
+        base_dir = getattr(sys, '_MEIPASS', None) or os.path.dirname(sys.executable)
+    else:
+        # Running as script: resolve next to this file, not the working directory
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, filename)
 
 # =====================================================
 # HELPER FUNCTION TO GET SURNAME
@@ -91,41 +159,22 @@ def get_surname(fullname):
         return fullname.split(",")[0].strip()
     return fullname
 
+# Any {{field}}; compiled once, fields are filled in a single pass
+_PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+def fill_placeholders(text, values):
+    """Replace each {{field}} found in values; unknown fields are left as typed"""
+    # A callable keeps backslashes in values from being read as escapes
+    return _PLACEHOLDER_RE.sub(lambda m: values.get(m.group(1), m.group(0)), text)
+
 # =====================================================
 # EMAIL VALIDATION
 # =====================================================
-def validate_email(email):
-    """
-    Validate email address format using regex
-    Returns (is_valid: bool, error_message: str)
-    """
-    if not email or not str(email).strip():
-        return False, "Email address is empty"
-    
-    email = str(email).strip()
-    
-    # Basic email regex pattern
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
-    if not re.match(pattern, email):
-        return False, f"Invalid email format: {email}"
-    
-    # Additional checks
-    if email.count('@') != 1:
-        return False, f"Email must contain exactly one @ symbol: {email}"
-    
-    local, domain = email.split('@')
-    
-    if len(local) == 0:
-        return False, "Local part of email is empty"
-    
-    if len(domain) == 0:
-        return False, "Domain part of email is empty"
-    
-    if domain.startswith('.') or domain.endswith('.'):
-        return False, f"Domain cannot start or end with dot: {domain}"
-    
-    return True, ""
+# Basic email regex pattern (compiled once, matched against the whole column).
+# The domain is a run of dot-separated labels, so a leading, trailing or doubled
+# dot can never match. Labels exclude the dot that separates them, so the
+# repeated group can split the domain only one way and fullmatch runs in linear time.
+_EMAIL_RE = re.compile(r'[A-Za-z0-9._%+\-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}')
 
 def validate_emails_in_dataframe(df, email_column="Email"):
     """
@@ -135,80 +184,104 @@ def validate_emails_in_dataframe(df, email_column="Email"):
     if df is None or email_column not in df.columns:
         return df, []
     
-    invalid_emails = []
-    valid_indices = []
+    # Vectorized check over the whole column instead of a per-row loop
+    emails = df[email_column].astype(str).str.strip()
+    empty = emails.eq("")  # Allow empty emails (will be filtered later)
+    valid_fmt = emails.str.fullmatch(_EMAIL_RE, na=False)
+    too_long = emails.str.len() > 254
+    keep = empty | (valid_fmt & ~too_long)
     
-    for idx, row in df.iterrows():
-        email = str(row[email_column]).strip()
-        is_valid, error = validate_email(email)
-        
-        if is_valid or email == "":  # Allow empty emails (will be filtered later)
-            valid_indices.append(idx)
-        else:
-            invalid_emails.append({
-                'row': idx + 2,  # +2 for Excel row number (header + 1-based)
-                'email': email,
-                'error': error
-            })
+    # Classify the failures by reason
+    invalid = ~keep
+    bad_emails = emails[invalid]
+    reasons = np.select(
+        [too_long[invalid].to_numpy()],
+        ["Email address is too long: "],
+        default="Invalid email format: "
+    )
+    errors = pd.Series(reasons, index=bad_emails.index, dtype=object) + bad_emails
+    invalid_emails = [
+        {
+            'row': idx + 2,  # +2 for Excel row number (header + 1-based)
+            'email': email,
+            'error': error
+        }
+        for idx, email, error in zip(bad_emails.index, bad_emails, errors)
+    ]
     
-    valid_df = df.iloc[valid_indices].copy() if valid_indices else df.iloc[0:0].copy()
+    valid_df = df.loc[keep].copy()
     return valid_df, invalid_emails
 
 # =====================================================
 # OUTLOOK-SAFE HTML BUILDER
 # =====================================================
+_RE_BODY = re.compile(r"<body[^>]*>([\s\S]*?)</body>", re.IGNORECASE)
+_RE_DIV = re.compile(r"<div\b([^>]*)>|</div>", re.IGNORECASE)
+_RE_HAS_P = re.compile(r"<p\b", re.IGNORECASE)
+_RE_MULTI_BR = re.compile(r"(?:<br\s*/?>\s*){2,}", re.IGNORECASE)
+# <br> runs outside paragraphs, or a whole paragraph (group 1 = its content)
+_RE_PARA_FUSED = re.compile(r"(?:<br\s*/?>\s*){2,}|<p\b[^>]*>([\s\S]*?)</p>", re.IGNORECASE)
+_RE_BR_SINGLE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+
+def _div_to_p(m):
+    attrs = m.group(1)
+    return "</p>" if attrs is None else f"<p{attrs}>"
+
+# Opening half of a paragraph table; the closing half depends on the spacing
+_PARA_PRE = (
+    '<table role="presentation" border="0" cellspacing="0" cellpadding="0" width="100%">'
+    '<tr><td style="line-height:1.35; mso-line-height-rule:exactly; font-family: Segoe UI, Arial, sans-serif;">'
+)
+
+@functools.lru_cache(maxsize=None)
+def _table_fragments(para_space_px: int):
+    """
+    Return the (<br>-run spacer, blank paragraph spacer, paragraph closer)
+    tables for a spacing. Normal paragraphs are _PARA_PRE + content + closer.
+    """
+    br_spacer = f'''<table role="presentation" border="0" cellspacing="0" cellpadding="0" width="100%"><tr><td style="padding:0 0 {para_space_px}px 0;"><span style="font-size:1px; line-height:1px;">&nbsp;</span></td></tr></table>'''
+    blank_para = f'''<table role="presentation" border="0" cellspacing="0" cellpadding="0" width="100%"><tr><td height="{para_space_px}" style="font-size:0; line-height:0;">&nbsp;</td></tr></table>'''
+    para_post = f'</td></tr><tr><td height="{para_space_px}" style="font-size:0; line-height:0;">&nbsp;</td></tr></table>'
+    return br_spacer, blank_para, para_post
+
 def build_outlook_safe_html(editor_html: str, para_spacing_px: int = 12) -> str:
     """
     Take rich HTML from QTextEdit.toHtml() and wrap it in an Outlook/Word-safe
     HTML shell with CSS resets to avoid extra spacing and reflow.
     """
-    html = editor_html or ""
-    PARA_SPACE_PX = max(0, int(para_spacing_px))
+    return _build_outlook_safe_html_cached(editor_html or "", max(0, int(para_spacing_px)))
+
+@functools.lru_cache(maxsize=8)
+def _build_outlook_safe_html_cached(editor_html: str, para_spacing_px: int) -> str:
+    """Memoized builder; the template and spacing rarely change between calls"""
+    html = editor_html
+    PARA_SPACE_PX = para_spacing_px
 
     # Extract inner <body> when present
-    body_match = re.search(r"<body[^>]*>([\s\S]*?)</body>", html, re.IGNORECASE)
+    body_match = _RE_BODY.search(html)
     inner = body_match.group(1) if body_match else html
-    # Normalize divs to paragraphs
-    inner = re.sub(r"<div\b([^>]*)>", r"<p\1>", inner, flags=re.IGNORECASE)
-    inner = re.sub(r"</div>", r"</p>", inner, flags=re.IGNORECASE)
-    had_paragraphs = bool(re.search(r"<p\b", inner, flags=re.IGNORECASE))
-    # Convert multiple <br> into spacer blocks (Outlook-safe)
-    inner = re.sub(
-        r"(?:<br\s*/?>\s*){2,}",
-        rf'''<table role="presentation" border="0" cellspacing="0" cellpadding="0" width="100%"><tr><td style="padding:0 0 {PARA_SPACE_PX}px 0;"><span style="font-size:1px; line-height:1px;">&nbsp;</span></td></tr></table>''',
-        inner,
-        flags=re.IGNORECASE
-    )
-
-    # Outlook spacing via tables
-    # 1) Blank paragraphs -> spacer table
-    inner = re.sub(
-        r"<p\b[^>]*>\s*</p>",
-        rf'''<table role="presentation" border="0" cellspacing="0" cellpadding="0" width="100%"><tr><td height="{PARA_SPACE_PX}" style="font-size:0; line-height:0;">&nbsp;</td></tr></table>''',
-        inner,
-        flags=re.IGNORECASE
-    )
-    # 2) Normal paragraphs -> table with content row + spacer row
-    def _wrap_para(m):
+    # Normalize divs to paragraphs (openers and closers in one pass)
+    inner = _RE_DIV.sub(_div_to_p, inner)
+    had_paragraphs = bool(_RE_HAS_P.search(inner))
+    # Outlook spacing via tables, in a single pass over the markup:
+    # 1) Multiple <br> -> spacer block
+    # 2) Blank paragraphs -> spacer table
+    # 3) Normal paragraphs -> table with content row + spacer row
+    br_spacer, blank_para, para_post = _table_fragments(PARA_SPACE_PX)
+
+    def _dispatch(m):
         content = m.group(1)
-        return (
-            f'<table role="presentation" border="0" cellspacing="0" cellpadding="0" width="100%">'
-            f'<tr><td style="line-height:1.35; mso-line-height-rule:exactly; font-family: Segoe UI, Arial, sans-serif;">{content}</td></tr>'
-            f'<tr><td height="{PARA_SPACE_PX}" style="font-size:0; line-height:0;">&nbsp;</td></tr></table>'
-        )
-    inner = re.sub(
-        r"<p\b[^>]*>([\s\S]*?)</p>",
-        _wrap_para,
-        inner,
-        flags=re.IGNORECASE
-    )
+        if content is None:
+            return br_spacer
+        if not content.strip():
+            return blank_para
+        return _PARA_PRE + _RE_MULTI_BR.sub(br_spacer, content) + para_post
+    inner = _RE_PARA_FUSED.sub(_dispatch, inner)
     # Fallback: if no paragraphs were present and no tables inserted, add spacing after single <br>
     if ('role="presentation"' not in inner) and (not had_paragraphs):
-        inner = re.sub(
-            r"<br\s*/?>",
-            rf'''<br/><table role="presentation" border="0" cellspacing="0" cellpadding="0" width="100%"><tr><td height="{PARA_SPACE_PX}" style="font-size:0; line-height:0;">&nbsp;</td></tr></table>''',
-            inner,
-            flags=re.IGNORECASE
+        inner = _RE_BR_SINGLE.sub(
+            f'''<br/><table role="presentation" border="0" cellspacing="0" cellpadding="0" width="100%"><tr><td height="{PARA_SPACE_PX}" style="font-size:0; line-height:0;">&nbsp;</td></tr></table>''',
+            inner
         )
 
     # Build final skeleton with resets
@@ -251,6 +324,63 @@ def build_outlook_safe_html(editor_html: str, para_spacing_px: int = 12) -> str:
 </html>"""
     return wrapped
 
+# Stand-in for {{fullname}} while the body template is wrapped once per batch
+_NAME_SENTINEL = "\x00NAME\x00"
+
+# Declarations Qt writes on every paragraph even when they hold the import default
+_RE_QT_DEFAULT_DECL = re.compile(r" (?:margin-left:0px|margin-right:0px|-qt-block-indent:0|text-indent:0px);")
+_RE_QT_BLOCK_STYLE = re.compile(r'<(p|li) style="([^"]*)"')
+
+def _trim_block_style(m):
+    style = _RE_QT_DEFAULT_DECL.sub("", m.group(2))
+    return f'<{m.group(1)} style="{style}"' if style else f"<{m.group(1)}"
+
+def _strip_qt_style(html):
+    """
+    Compact QTextEdit.toHtml() output for storage by dropping default-valued
+    paragraph declarations. Loading the result with setHtml() gives back the
+    same document.
+    """
+    return _RE_QT_BLOCK_STYLE.sub(_trim_block_style, html)
+
+# =====================================================
+# DEFAULT EMAIL TEMPLATE
+# =====================================================
+_DEFAULT_SUBJECT = "NOTICE TO SUBMIT LACKING EMPLOYMENT REQUIREMENTS - {{fullname}}"
+_DEFAULT_BODY_HTML = """
+<p>Dear {{fullname}},</p>
+
+<p>This is to formally inform you that you still have outstanding mandatory employment requirements as of this date, despite prior reminders and your signed Affidavit of Undertaking upon commencement of employment.</p>
+
+<p>As stated in your Affidavit of Undertaking, you committed to submit all required documents within prescribed period. <b>You are hereby given five (5) days from receipt of this email notice </b> to complete and submit pending requirements. Please see the attached <b>Notice of Incomplete Employment Requirements</b> for full details. Failure to comply within the given timeframe, may result in appropriate administrative action in accordance with Company policy.</p>
+
+<p>Please submit the required documents through this same email thread. For any clarification, please coordinate with <b>HR-DMRC or your assigned account supervisor.</b></p>
+
+<p>Thanks,<br>Jhudel S. Orola<br>HR Staff - Data Management & Records Control<br>Acabar Marketing International Inc.<br>(02) 8887-8170 Local 153</p>
+
+<p><img class="x_CToWUd" height="77" width="250" src="https://ci3.googleusercontent.com/mail-sig/AIorK4x0oCXqeBBsjR9hQB3HLxhAJPc1msod_2dqrIiATYz-sDfATgJdOa_R6eWlr16--ykbMmeApG_G3we-" data-imagetype="External"></p>
+"""
+
+# Layout of the preview dialog; parsed once, filled per preview
+_PREVIEW_TMPL = string.Template("""
+        <div style="font-family: Segoe UI, Arial, sans-serif; padding: 20px;">
+            <h3 style="color: #1e40af; margin-bottom: 15px;">Subject: $subject</h3>
+            <div style="border-top: 1px solid #e2e8f0; padding-top: 15px;">
+                $final_html
+            </div>
+        </div>
+        """)
+
+_default_body_doc = None
+
+def default_body_document(parent=None):
+    """Return a copy of the default body, parsing its HTML only on first use"""
+    global _default_body_doc
+    if _default_body_doc is None:  # Needs a QApplication, so not at import time
+        _default_body_doc = QTextDocument()
+        _default_body_doc.setHtml(_DEFAULT_BODY_HTML)
+    return _default_body_doc.clone(parent)
+
 # =====================================================
 # EMAIL WORKER THREAD WITH COM RETRY LOGIC
 # =====================================================
@@ -260,18 +390,89 @@ class EmailWorker(QThread):
     status_updated = Signal(int, str)
     finished_sending = Signal()
 
+    SEND_BATCH_SIZE = 25  # Queued sends between Outbox flushes
+    LOG_BATCH_SIZE = 32  # Buffered log lines per log_updated emit
+    LOG_FLUSH_INTERVAL = 0.25  # Max seconds a log line waits in the buffer
+
     def __init__(self, dataframe, subject, body_template, para_spacing_px=12, max_retries=3):
         super().__init__()
-        self.df = dataframe
+        # Rename once so rows can be read as attributes from itertuples(); the
+        # caller's frame is never modified
+        self.df = dataframe.rename(columns={
+            "Full Name": "FullName",
+            "Attachment Path": "AttachmentPath"
+        })
         self.subject = subject
         self.body_template = body_template
+        self._subject_has_ph = "{{fullname}}" in subject
+        self._body_has_ph = "{{fullname}}" in body_template
         self.para_spacing_px = int(para_spacing_px) if para_spacing_px is not None else 12
         self.max_retries = max_retries
         self.running = True
+        self._attachment_exists = {}
+        self._queued = 0
+        self._log_buf = []
+        self._last_log_flush = time.monotonic()
 
     def stop(self):
         self.running = False
 
+    def _log(self, message):
+        """Buffer a log line; lines cross the thread boundary in batches"""
+        self._log_buf.append(message)
+        if (len(self._log_buf) >= self.LOG_BATCH_SIZE
+                or time.monotonic() - self._last_log_flush >= self.LOG_FLUSH_INTERVAL):
+            self._flush_log()
+
+    def _flush_log(self):
+        if self._log_buf:
+            self.log_updated.emit("\n".join(self._log_buf))
+            self._log_buf.clear()
+        self._last_log_flush = time.monotonic()
+
+    def _render_messages(self):
+        """Precompute the subject and HTML body for every recipient"""
+        # Vectorized name handling, one pass per column
+        full_names = self.df["FullName"].astype("string").str.strip().fillna("")  # e.g. "Dela Cruz, Juan"
+        self.df["Surname"] = full_names.str.split(",", n=1).str[0].str.strip()    # e.g. "Dela Cruz"
+
+        # Full name in subject, surname in body; without a placeholder every
+        # recipient shares the same string
+        if self._subject_has_ph:
+            subject = self.subject  # Local: looked up once, not per recipient
+            self.df["Subject"] = full_names.map(lambda name: subject.replace("{{fullname}}", name))
+        else:
+            self.df["Subject"] = self.subject
+        if self._body_has_ph:
+            wrapped = build_outlook_safe_html(
+                self.body_template.replace("{{fullname}}", _NAME_SENTINEL), self.para_spacing_px
+            )
+            self.df["HTMLBody"] = self.df["Surname"].map(lambda name: wrapped.replace(_NAME_SENTINEL, name))
+        else:
+            self.df["HTMLBody"] = build_outlook_safe_html(self.body_template, self.para_spacing_px)
+
+    def _flush_outbox(self):
+        """Push queued mail out of the Outbox and wait (max 30 sec) for it to drain"""
+        if not self._queued:
+            return
+        self._flush_log()  # Show buffered lines before the (up to 30 sec) wait
+        try:
+            self._namespace.SendAndReceive(False)
+        except Exception:
+            pass
+        # Expected Sent Items count is tracked locally instead of re-querying per send
+        target = self._sent_count + self._queued
+        deadline = time.monotonic() + 30
+        delay = 0.05
+        while self._outbox_items.Count != 0 and self._sent_items.Count < target:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 1.0)
+        self._sent_count = self._sent_items.Count
+        self._queued = 0
+
     def run(self):
         try:
             import pythoncom
@@ -281,15 +482,21 @@ class EmailWorker(QThread):
             outlook = None
             for attempt in range(5):
                 try:
-                    outlook = win32com.client.Dispatch("Outlook.Application")
-                    self.log_updated.emit("✅ Connected to Outlook COM.")
+                    try:
+                        # Early-bound wrapper: property writes skip the IDispatch name lookup
+                        outlook = win32com.client.gencache.EnsureDispatch("Outlook.Application")
+                    except Exception:
+                        outlook = win32com.client.Dispatch("Outlook.Application")
+                    self._log("✅ Connected to Outlook COM.")
                     break
                 except Exception as e:
-                    self.log_updated.emit(f"⚠ Attempt {attempt +1} failed to connect Outlook: {e}")
+                    self._log(f"⚠ Attempt {attempt +1} failed to connect Outlook: {e}")
+                    self._flush_log()
                     time.sleep(3)
 
             if not outlook:
-                self.log_updated.emit("❌ Could not connect to Outlook. Make sure it is open and fully ready.")
+                self._log("❌ Could not connect to Outlook. Make sure it is open and fully ready.")
+                self._flush_log()
                 self.finished_sending.emit()
                 return
 
@@ -298,129 +505,231 @@ class EmailWorker(QThread):
                 outbox = namespace.GetDefaultFolder(4)  # olFolderOutbox
                 sent = namespace.GetDefaultFolder(5)    # olFolderSentMail
             except Exception as e:
-                self.log_updated.emit(f"❌ Outlook is busy or not ready: {e}")
+                self._log(f"❌ Outlook is busy or not ready: {e}")
+                self._flush_log()
                 self.finished_sending.emit()
                 return
 
+            # Cache the collections; every COM property access is a cross-process call
+            self._namespace = namespace
+            self._outbox_items = outbox.Items
+            self._sent_items = sent.Items
+            self._sent_count = self._sent_items.Count
+
+            self._render_messages()
+
+            # Stat each distinct attachment once instead of on every send/retry
+            emails = self.df["Email"].astype(str).str.strip()
+            attachment_paths = self.df["AttachmentPath"].astype(str).str.strip()
+            self._attachment_exists = {path: os.path.exists(path) for path in attachment_paths.unique()}
+
+            # Rows without an email or attachment can never be sent; fail them up
+            # front so they skip the COM calls and the retry passes
+            no_email = emails.eq("")
+            skipped = no_email | ~attachment_paths.map(self._attachment_exists).astype(bool)
+            for index, missing_email, attachment in zip(
+                self.df.index[skipped], no_email[skipped], attachment_paths[skipped]
+            ):
+                self.status_updated.emit(index, "Failed")
+                if missing_email:
+                    self._log(f"❌ No email for row {index + 2}")
+                else:
+                    self._log(f"❌ Attachment not found: {attachment}")
+            skipped_count = int(skipped.sum())
+
             total = len(self.df)
-            processed_count = 0
+            processed_count = skipped_count
+            if skipped_count:
+                self.progress_updated.emit(int((processed_count / total) * 100))
             failed_emails = []  # Track failed emails for retry
 
             # First pass: try to send all emails
-            for index, row in self.df.iterrows():
+            for row in self.df.loc[~skipped].itertuples(index=True):
+                index = row.Index
                 if not self.running:
-                    self.log_updated.emit("⛔ Sending stopped by user.")
+                    self._log("⛔ Sending stopped by user.")
                     break
 
-                success = self._send_single_email(outlook, outbox, sent, row, index)
+                success = self._send_single_email(outlook, row, index)
                 if not success:
                     failed_emails.append((index, row))
+                elif self._queued >= self.SEND_BATCH_SIZE:
+                    self._flush_outbox()
                 
                 processed_count += 1
                 percent = int((processed_count / total) * 100)
                 self.progress_updated.emit(percent)
 
+            self._flush_outbox()
+
             # Retry failed emails if any
             if failed_emails and self.max_retries > 0:
-                self.log_updated.emit(f"🔄 Retrying {len(failed_emails)} failed emails...")
+                self._log(f"🔄 Retrying {len(failed_emails)} failed emails...")
                 
                 for retry_attempt in range(self.max_retries):
                     if not self.running or not failed_emails:
                         break
                     
-                    self.log_updated.emit(f"🔄 Retry attempt {retry_attempt + 1}/{self.max_retries}")
+                    self._log(f"🔄 Retry attempt {retry_attempt + 1}/{self.max_retries}")
                     still_failed = []
                     
                     for index, row in failed_emails:
                         if not self.running:
                             break
                         
-                        success = self._send_single_email(outlook, outbox, sent, row, index)
+                        success = self._send_single_email(outlook, row, index)
                         if not success:
                             still_failed.append((index, row))
+                        elif self._queued >= self.SEND_BATCH_SIZE:
+                            self._flush_outbox()
                     
+                    self._flush_outbox()
                     failed_emails = still_failed
                     
                     if failed_emails:
+                        self._flush_log()
                         time.sleep(2)  # Wait before next retry attempt
 
-            if failed_emails:
-                self.log_updated.emit(f"⚠️ {len(failed_emails)} emails still failed after all retries")
+            if failed_emails or skipped_count:
+                self._log(f"⚠️ {len(failed_emails) + skipped_count} emails still failed after all retries")
 
+            self._flush_log()
             self.finished_sending.emit()
 
         except Exception as e:
-            self.log_updated.emit(f"FATAL ERROR in worker: {str(e)}")
+            self._log(f"FATAL ERROR in worker: {str(e)}")
+            self._flush_log()
             self.finished_sending.emit()
 
-    def _send_single_email(self, outlook, outbox, sent, row, index):
-        """Send a single email with error handling"""
+    def _send_single_email(self, outlook, row, index):
+        """Send a single email with error handling (row is an itertuples() record)"""
         try:
-            email = str(row["Email"]).strip()
-            cc_value = str(row["CC"]).strip()
-            attachment = str(row["Attachment Path"]).strip()
-
-            if not email:
-                self.status_updated.emit(index, "Failed")
-                self.log_updated.emit(f"❌ No email for row {index + 2}")
-                return False
-                
-            if not os.path.exists(attachment):
-                self.status_updated.emit(index, "Failed")
-                self.log_updated.emit(f"❌ Attachment not found: {attachment}")
-                return False
-
-            start_sent_count = sent.Items.Count
-
-            # --- ✅ NEW LOGIC HERE ---
-            full_name = str(row["Full Name"]).strip()   # e.g. "Dela Cruz, Juan"
-            surname = get_surname(full_name)            # e.g. "Dela Cruz"
-
-            # Replace placeholders accordingly
-            subject = self.subject.replace("{{fullname}}", full_name)
-            body_raw = self.body_template.replace("{{fullname}}", surname)
-            body = build_outlook_safe_html(body_raw, self.para_spacing_px)
+            email = str(row.Email).strip()
+            cc_value = str(row.CC).strip()
+            attachment = str(row.AttachmentPath).strip()
 
             mail = outlook.CreateItem(0)  # olMailItem
             mail.To = email
             if cc_value:  # Only set CC if not empty
                 mail.CC = cc_value
-            mail.Subject = subject        # ✅ Full name in subject
-            try:
-                mail.BodyFormat = 2  # 2 = olFormatHTML
-            except Exception:
-                pass
-            mail.HTMLBody = body          # ✅ Surname in body
+            mail.Subject = row.Subject    # ✅ Full name in subject
+            mail.HTMLBody = row.HTMLBody  # ✅ Surname in body (also switches BodyFormat to HTML)
             mail.Importance = 2  # High
             mail.ReadReceiptRequested = True
             mail.Attachments.Add(attachment)
             mail.Send()
 
-            # Wait until sent or max 30 sec
-            for _ in range(30):
-                if outbox.Items.Count == 0 or sent.Items.Count > start_sent_count:
-                    break
-                time.sleep(1)
+            self._queued += 1  # The Outbox is flushed once per batch, not per send
 
             self.status_updated.emit(index, "Sent")
-            self.log_updated.emit(f"✅ Sent to {email}")
+            self._log(f"✅ Sent to {email}")
             return True
 
         except Exception as e:
             self.status_updated.emit(index, "Failed")
-            self.log_updated.emit(f"❌ Error sending to {email}: {str(e)}")
+            self._log(f"❌ Error sending to {email}: {str(e)}")
             return False
 
 
+# =====================================================
+# RECIPIENT TABLE MODEL
+# =====================================================
+class DataFrameModel(QAbstractTableModel):
+    """Read-only table model that serves cells from a NumPy snapshot of a DataFrame"""
+    STATUS_COLUMN = 4
+    STATUSES = ["Pending", "Sent", "Failed"]  # Categories of the Status column
+    # Built once and indexed by category code; code -1 (missing) picks the trailing None
+    _STATUS_BG = (
+        QColor(0xff, 0xf3, 0xcd),  # Pending
+        QColor(0xd4, 0xed, 0xda),  # Sent
+        QColor(0xf8, 0xd7, 0xda),  # Failed
+        None,
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._df = None
+        self._values = None  # df.to_numpy(); plain indexing, no pandas indexer per cell
+        self._status_codes = None  # int8 category codes of the Status column
+
+    def set_dataframe(self, df):
+        """Swap in a new DataFrame with a single model reset"""
+        self.beginResetModel()
+        self._df = df
+        self._values = None if df is None else df.to_numpy()
+        self._status_codes = None if df is None else df.iloc[:, self.STATUS_COLUMN].cat.codes.to_numpy(copy=True)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if self._df is None or parent.isValid() else len(self._df)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if self._df is None or parent.isValid() else len(self._df.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and self._df is not None:
+            if orientation == Qt.Horizontal:
+                return str(self._df.columns[section])
+            return str(section + 1)
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or self._df is None:
+            return None
+        if role == Qt.DisplayRole:
+            value = self._values[index.row(), index.column()]
+            return "" if value is None else str(value)
+        if role == Qt.BackgroundRole and index.column() == self.STATUS_COLUMN:
+            return self._STATUS_BG[self._status_codes[index.row()]]
+        return None
+
+    def refresh_cell(self, row, column):
+        """Re-read one cell from the DataFrame and repaint it"""
+        self._values[row, column] = self._df.iat[row, column]
+        if column == self.STATUS_COLUMN:
+            self._status_codes[row] = self._df.iloc[:, column].cat.codes.iat[row]
+        index = self.index(row, column)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.BackgroundRole])
+
+
+# =====================================================
+# MODERN STYLES
+# =====================================================
+@functools.lru_cache(maxsize=None)
+def _load_modern_qss():
+    """Read styles.qss once; an unstyled window beats a crash if it is missing"""
+    try:
+        with open(_resolve_resource_path("styles.qss"), "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError as e:
+        print(f"Failed to load stylesheet: {e}")
+        return ""
+
 # =====================================================
 # MAIN APPLICATION
 # =====================================================
 class EmailApp(QWidget):
+    # (key sequence, handler method name) for each window-wide shortcut
+    _SHORTCUTS = (
+        ("Ctrl+E", "export_template"),
+        ("Ctrl+O", "load_excel"),
+        ("Ctrl+S", "start_sending"),
+        ("Ctrl+Shift+S", "stop_sending"),
+        ("Ctrl+P", "preview_email"),
+        ("Ctrl+T", "save_template"),
+        ("Ctrl+B", "make_bold"),
+        ("Ctrl+I", "make_italic"),
+        ("Ctrl+U", "make_underline"),
+    )
+
+    PREVIEW_SAMPLE_LIMIT = 20  # Recipients offered in the preview's sample list
+
     def __init__(self):
         super().__init__()
 
         # Initialize settings manager
         self.settings = SettingsManager()
+        QApplication.instance().aboutToQuit.connect(self.settings.flush)
         
         # Setup file-based logging
         self.setup_logging()
@@ -429,27 +738,10 @@ class EmailApp(QWidget):
         self.setMinimumSize(1400, 1000)
         self.setStyleSheet(self.modern_styles())
         
-        # Set application icon and style
-        window_icon = self.create_app_icon()
-        self.setWindowIcon(window_icon)
-        
-        # Set application-wide icon for all windows
-        app_icon = QIcon()
-        icon_sizes = [16, 32, 48, 64, 128, 256]
-        
-        # Determine icon path based on environment
-        icon_base_path = "EMAIL.ico"
-        if getattr(sys, 'frozen', False):
-            # First try PyInstaller's temporary directory where bundled files are extracted
-            if hasattr(sys, '_MEIPASS'):
-                icon_base_path = os.path.join(sys._MEIPASS, "EMAIL.ico")
-            else:
-                # Fallback to executable directory
-                app_dir = os.path.dirname(sys.executable)
-                icon_base_path = os.path.join(app_dir, "EMAIL.ico")
-        
-        for size in icon_sizes:
-            app_icon.addFile(icon_base_path, QSize(size, size))
+        # Set application icon; the multi-resolution .ico is decoded once and
+        # shared by this window and the application
+        app_icon = self.create_app_icon()
+        self.setWindowIcon(app_icon)
         QApplication.setWindowIcon(app_icon)
         
         # Start maximized
@@ -480,12 +772,6 @@ class EmailApp(QWidget):
         # Dashboard content splitter
         content_splitter = QSplitter(Qt.Horizontal)
         content_splitter.setHandleWidth(2)
-        content_splitter.setStyleSheet("""
-            QSplitter::handle {
-                background-color: #3a3f5a;
-                border-radius: 1px;
-            }
-        """)
         
         # LEFT PANEL - DATA TABLE (wider)
         left_panel = self.create_table_panel()
@@ -504,15 +790,14 @@ class EmailApp(QWidget):
         self.tab_widget.addTab(dashboard_tab, "📊 Main Dashboard")
         
         # TAB 2: EMAIL COMPOSER (WIDE VIEW)
-        composer_tab = QWidget()
-        composer_layout = QVBoxLayout(composer_tab)
-        composer_layout.setContentsMargins(0, 0, 0, 0)
-        composer_layout.setSpacing(15)
-        
-        # Email composer with wide view
-        email_composer_widget = self.create_email_panel()
-        composer_layout.addWidget(email_composer_widget)
-        self.tab_widget.addTab(composer_tab, "✉️ Email Composer")
+        # Built on first use (see _ensure_composer_built) to keep startup light
+        self.composer_tab = QWidget()
+        self.composer_layout = QVBoxLayout(self.composer_tab)
+        self.composer_layout.setContentsMargins(0, 0, 0, 0)
+        self.composer_layout.setSpacing(15)
+        self.tab_widget.addTab(self.composer_tab, "✉️ Email Composer")
+        self._composer_built = False
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
         
         main_layout.addWidget(self.tab_widget)
 
@@ -524,11 +809,28 @@ class EmailApp(QWidget):
         
         self.df = None
         self.worker = None
+        self._preview_dialog = None
+        self._preview_samples_source = None  # self.df the preview samples were taken from
+        self._spacing_format = None  # (px, QTextBlockFormat, CSS) of the last applied spacing
+        self._template_index = {}  # Template name -> template combo index
+        # Saved templates, read from settings once; writes go through to settings
+        self._templates_cache = dict(self.settings.get(_SK_TEMPLATES, {}))
+        self._loaded_template = None  # (name, subject, body) last put in the composer
+        
+        # Log lines are appended to the log box at most once per frame
+        self._log_buffer = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(16)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+        
+        # Spacing changes are applied once the selection settles
+        self._spacing_timer = QTimer(self)
+        self._spacing_timer.setSingleShot(True)
+        self._spacing_timer.setInterval(150)
+        self._spacing_timer.timeout.connect(self._commit_spacing)
         
         # Initialize UI state
-        self.load_templates()  # Load saved templates
-        # Unblock signals after initialization is complete
-        self.template_combo.blockSignals(False)
         self.setup_keyboard_shortcuts()  # Setup keyboard shortcuts
         self.update_ui_state()
 
@@ -537,19 +839,7 @@ class EmailApp(QWidget):
     # =================================================
     def create_app_icon(self):
         """Create app icon using the EMAIL.ico file"""
-        # Handle both script and executable environments
-        icon_path = "EMAIL.ico"
-        
-        # If running as executable, check PyInstaller's temporary directory first
-        if getattr(sys, 'frozen', False):
-            # First try PyInstaller's temporary directory where bundled files are extracted
-            if hasattr(sys, '_MEIPASS'):
-                icon_path = os.path.join(sys._MEIPASS, "EMAIL.ico")
-            else:
-                # Fallback to executable directory
-                app_dir = os.path.dirname(sys.executable)
-                icon_path = os.path.join(app_dir, "EMAIL.ico")
-        
+        icon_path = _resolve_resource_path("EMAIL.ico")
         if os.path.exists(icon_path):
             return QIcon(icon_path)
         else:
@@ -622,17 +912,6 @@ class EmailApp(QWidget):
         
         self.recipient_counter = QLabel("📊 0 recipients loaded")
         self.recipient_counter.setObjectName("recipientCounter")
-        self.recipient_counter.setStyleSheet("""
-            QLabel#recipientCounter {
-                color: #64748b;
-                font-size: 10pt;
-                font-weight: 500;
-                padding: 4px 8px;
-                background: #f1f5f9;
-                border-radius: 12px;
-                border: 1px solid #e2e8f0;
-            }
-        """)
         
         header_row.addWidget(table_header)
         header_row.addStretch()
@@ -640,8 +919,10 @@ class EmailApp(QWidget):
         table_layout.addLayout(header_row)
         
         # Create table
-        self.table = QTableWidget()
+        self.table_model = DataFrameModel(self)
+        self.table = QTableView()
         self.table.setObjectName("dataTable")
+        self.table.setModel(self.table_model)
         self.table.setAlternatingRowColors(True)
         self.table.setShowGrid(True)
         self.table.verticalHeader().setVisible(False)
@@ -672,9 +953,9 @@ class EmailApp(QWidget):
         template_label = QLabel("Template:")
         self.template_combo = QComboBox()
         self.template_combo.setObjectName("templateCombo")
-        self.template_combo.addItem("Default HR Notice", "default")
-        # Block signals during initialization to prevent overwriting saved settings
-        self.template_combo.blockSignals(True)
+        self.template_combo.addItem("Default HR Notice", _DEFAULT_TEMPLATE_KEY)
+        # load_templates() fills the combo with signals blocked, so the saved
+        # selection isn't overwritten during initialization
         self.template_combo.currentIndexChanged.connect(self.load_template)
         
         self.save_template_btn = QPushButton("💾 Save Template")
@@ -696,7 +977,7 @@ class EmailApp(QWidget):
         self.subject_input = QLineEdit()
         self.subject_input.setObjectName("subjectInput")
         self.subject_input.setPlaceholderText("Enter email subject here...")
-        self.subject_input.setText("NOTICE TO SUBMIT LACKING EMPLOYMENT REQUIREMENTS - {{fullname}}")
+        self.subject_input.setText(_DEFAULT_SUBJECT)
         subject_layout.addWidget(self.subject_input)
         
         email_layout.addWidget(subject_group)
@@ -737,7 +1018,7 @@ class EmailApp(QWidget):
         self.spacing_select.addItem("Relaxed", 16)
         
         # Load saved spacing setting
-        saved_spacing = self.settings.get("paragraph_spacing", 12)
+        saved_spacing = self.settings.get(_SK_SPACING, 12)
         for i in range(self.spacing_select.count()):
             if self.spacing_select.itemData(i) == saved_spacing:
                 self.spacing_select.setCurrentIndex(i)
@@ -764,31 +1045,30 @@ class EmailApp(QWidget):
         self.email_editor.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.email_editor.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         
-        default_body = """
-<p>Dear {{fullname}},</p>
-
-<p>This is to formally inform you that you still have outstanding mandatory employment requirements as of this date, despite prior reminders and your signed Affidavit of Undertaking upon commencement of employment.</p>
-
-<p>As stated in your Affidavit of Undertaking, you committed to submit all required documents within prescribed period. <b>You are hereby given five (5) days from receipt of this email notice </b> to complete and submit pending requirements. Please see the attached <b>Notice of Incomplete Employment Requirements</b> for full details. Failure to comply within the given timeframe, may result in appropriate administrative action in accordance with Company policy.</p>
-
-<p>Please submit the required documents through this same email thread. For any clarification, please coordinate with <b>HR-DMRC or your assigned account supervisor.</b></p>
-
-<p>Thanks,<br>Jhudel S. Orola<br>HR Staff - Data Management & Records Control<br>Acabar Marketing International Inc.<br>(02) 8887-8170 Local 153</p>
-
-<p><img class="x_CToWUd" height="77" width="250" src="https://ci3.googleusercontent.com/mail-sig/AIorK4x0oCXqeBBsjR9hQB3HLxhAJPc1msod_2dqrIiATYz-sDfATgJdOa_R6eWlr16--ykbMmeApG_G3we-" data-imagetype="External"></p>
-"""
-        self.email_editor.setHtml(default_body)
-        # Apply spacing to the entire document so the composer preview matches
-        try:
-            self.apply_editor_paragraph_spacing(int(self.spacing_select.currentData()))
-        except Exception:
-            self.apply_editor_paragraph_spacing(12)
+        # The body and its spacing are put in by load_templates(), which runs next
         
         body_layout.addWidget(self.email_editor)
         email_layout.addWidget(body_group)
         
         return email_frame
     
+    def _on_tab_changed(self, index):
+        if self.tab_widget.widget(index) is self.composer_tab:
+            self._ensure_composer_built()
+
+    def _ensure_composer_built(self):
+        """Build the Email Composer tab the first time it is needed"""
+        if self._composer_built:
+            return
+        self._composer_built = True
+        self.tab_widget.currentChanged.disconnect(self._on_tab_changed)
+        
+        # Email composer with wide view
+        email_composer_widget = self.create_email_panel()
+        self.composer_layout.addWidget(email_composer_widget)
+        
+        self.load_templates()  # Load saved templates
+    
     def create_status_section(self):
         """Create the status section with progress and logs"""
         status_frame = QFrame()
@@ -845,18 +1125,21 @@ class EmailApp(QWidget):
         if not file_path:
             return
         try:
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Email Sending Setup"
-            headers = ["Full Name", "Email", "CC", "Attachment Path"]
-            for col, header in enumerate(headers, start=1):
-                ws.cell(row=1, column=col, value=header).font = Font(bold=True)
-            ws.cell(row=2, column=1).value = "Dela Cruz, Juan"
-            ws.cell(row=2, column=2).value = "juan@email.com"
-            ws.cell(row=2, column=3).value = ""
-            ws.cell(row=2, column=4).value = "C:\\Path\\To\\Attachment.pdf"
+            # Write-only mode streams rows straight to XML
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet("Email Sending Setup")
+            # Column widths must be set before the first row is written
             for col_letter, width in zip(["A", "B", "C", "D"], [25, 30, 30, 40]):
                 ws.column_dimensions[col_letter].width = width
+            headers = ["Full Name", "Email", "CC", "Attachment Path"]
+            bold = Font(bold=True)
+            header_cells = []
+            for header in headers:
+                cell = WriteOnlyCell(ws, value=header)
+                cell.font = bold
+                header_cells.append(cell)
+            ws.append(header_cells)
+            ws.append(["Dela Cruz, Juan", "juan@email.com", "", "C:\\Path\\To\\Attachment.pdf"])
             wb.save(file_path)
             QMessageBox.information(self, "Success", "Excel template exported successfully.")
         except Exception as e:
@@ -872,13 +1155,17 @@ class EmailApp(QWidget):
         if not file_path:
             return
         try:
-            df = pd.read_excel(file_path, sheet_name="Email Sending Setup")
-            df = df.rename(columns={
-                df.columns[0]: "Full Name",
-                df.columns[1]: "Email",
-                df.columns[2]: "CC",
-                df.columns[3]: "Attachment Path"
-            })
+            # Stream the sheet: read-only parsing, plain values instead of Cell objects
+            wb = load_workbook(file_path, read_only=True, data_only=True)
+            try:
+                ws = wb["Email Sending Setup"]
+                rows = list(ws.iter_rows(min_row=2, max_col=4, values_only=True))  # Skip header row
+                # Trim trailing blank rows, as read_excel does
+                while rows and all(value is None for value in rows[-1]):
+                    rows.pop()
+                df = pd.DataFrame(rows, columns=["Full Name", "Email", "CC", "Attachment Path"])
+            finally:
+                wb.close()
             df = df.fillna("")
             
             # Validate emails
@@ -886,9 +1173,10 @@ class EmailApp(QWidget):
             
             # Show validation results
             if invalid_emails:
-                error_msg = "The following emails have invalid format:\n\n"
-                for item in invalid_emails[:10]:  # Show max 10 errors
-                    error_msg += f"Row {item['row']}: {item['email']} - {item['error']}\n"
+                error_msg = "The following emails have invalid format:\n\n" + "".join(
+                    f"Row {item['row']}: {item['email']} - {item['error']}\n"
+                    for item in invalid_emails[:10]  # Show max 10 errors
+                )
                 
                 if len(invalid_emails) > 10:
                     error_msg += f"... and {len(invalid_emails) - 10} more errors\n"
@@ -898,14 +1186,10 @@ class EmailApp(QWidget):
             
             # Use validated dataframe
             df = valid_df
-            df["Status"] = "Pending"
+            df["Status"] = pd.Categorical(["Pending"] * len(df), categories=DataFrameModel.STATUSES)
             self.df = df[["Full Name", "Email", "CC", "Attachment Path", "Status"]]
             self.populate_table()
             
-            # Update recipient counter
-            recipient_count = len(self.df)
-            self.recipient_counter.setText(f"📊 {recipient_count} recipient{'s' if recipient_count != 1 else ''} loaded")
-            
             # Save the path for next time
             self.settings.set("last_excel_path", file_path)
             
@@ -921,38 +1205,32 @@ class EmailApp(QWidget):
     # POPULATE TABLE
     # =================================================
     def populate_table(self):
-        self.table.setRowCount(len(self.df))
-        self.table.setColumnCount(len(self.df.columns))
-        self.table.setHorizontalHeaderLabels(self.df.columns)
-        
-        # Set column widths
-        header = self.table.horizontalHeader()
-        header.setStretchLastSection(False)  # Don't stretch last section (Status)
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)  # Full Name
-        header.setSectionResizeMode(1, QHeaderView.Stretch)  # Email
-        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)  # CC
-        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)  # Attachment Path
-        header.setSectionResizeMode(4, QHeaderView.Fixed)  # Status - fixed width
-        header.setDefaultSectionSize(100)  # Default width for stretch columns
-        
-        # Set specific width for Status column
-        header.resizeSection(4, 80)  # Status column width
-        
-        for i in range(len(self.df)):
-            for j in range(len(self.df.columns)):
-                item = QTableWidgetItem(str(self.df.iloc[i, j]))
-                
-                # Color code status
-                if j == 4:  # Status column
-                    status = str(self.df.iloc[i, j]).lower()
-                    if status == "sent":
-                        item.setBackground(QColor("#d4edda"))
-                    elif status == "failed":
-                        item.setBackground(QColor("#f8d7da"))
-                    elif status == "pending":
-                        item.setBackground(QColor("#fff3cd"))
-                
-                self.table.setItem(i, j, item)
+        # Reset and resize with painting off, so the table repaints once at the end
+        self.table.setUpdatesEnabled(False)
+        try:
+            # One model reset; cells are only materialized when the view paints them
+            self.table_model.set_dataframe(self.df)
+            
+            # Set column widths (a model reset clears per-section modes, so after
+            # loading); content-sized columns stay Interactive and are measured
+            # once below instead of on every layout pass
+            header = self.table.horizontalHeader()
+            header.setStretchLastSection(False)  # Don't stretch last section (Status)
+            header.setSectionResizeMode(0, QHeaderView.Interactive)  # Full Name
+            header.setSectionResizeMode(1, QHeaderView.Stretch)  # Email
+            header.setSectionResizeMode(2, QHeaderView.Interactive)  # CC
+            header.setSectionResizeMode(3, QHeaderView.Interactive)  # Attachment Path
+            header.setSectionResizeMode(4, QHeaderView.Fixed)  # Status - fixed width
+            header.setDefaultSectionSize(100)  # Default width for stretch columns
+            
+            # Set specific width for Status column
+            header.resizeSection(4, 80)  # Status column width
+            
+            # Fit Full Name, CC and Attachment Path to their contents once, after loading
+            for column in (0, 2, 3):
+                self.table.resizeColumnToContents(column)
+        finally:
+            self.table.setUpdatesEnabled(True)
 
     # =================================================
     # START / STOP SENDING
@@ -965,6 +1243,7 @@ class EmailApp(QWidget):
             QMessageBox.warning(self, "⚠️ Warning", "No rows to send.")
             return
 
+        self._ensure_composer_built()
         subject = self.subject_input.text()
         body = self.email_editor.toHtml()
 
@@ -977,9 +1256,12 @@ class EmailApp(QWidget):
             max_retries = 3
 
         # Save current settings
-        self.settings.set("paragraph_spacing", spacing_px)
+        self.settings.set(_SK_SPACING, spacing_px)
 
-        self.worker = EmailWorker(self.df, subject, body, spacing_px, max_retries)
+        # Hand off only the columns the worker sends from; it owns that frame,
+        # while self.df stays with the UI for status updates
+        send_df = self.df[["Full Name", "Email", "CC", "Attachment Path"]]
+        self.worker = EmailWorker(send_df, subject, body, spacing_px, max_retries)
         self.worker.progress_updated.connect(self.progress_bar.setValue)
         self.worker.log_updated.connect(self.log)
         self.worker.status_updated.connect(self.update_status)
@@ -1001,30 +1283,30 @@ class EmailApp(QWidget):
     # UPDATE STATUS & LOGS
     # =================================================
     def update_status(self, row, status):
-        self.table.setItem(row, 4, QTableWidgetItem(status))
-        # Update the dataframe as well
-        if self.df is not None and row < len(self.df):
-            self.df.iloc[row, 4] = status
+        # Worker rows are DataFrame labels; the view needs the position
+        if self.df is not None and row in self.df.index:
+            pos = self.df.index.get_loc(row)
+            self.df.iat[pos, 4] = status
+            self.table_model.refresh_cell(pos, 4)
 
     def log(self, message):
         """Log message to both UI and file"""
-        self.log_box.append(message)
-        
-        # Also log to file
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_message = f"[{timestamp}] {message}"
-        
-        try:
-            with open("email_sender.log", "a", encoding="utf-8") as f:
-                f.write(log_message + "\n")
-        except Exception:
-            pass  # Silently fail if logging doesn't work
+        self._log_buffer.append(message)
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+        self._logger.info(message)
+
+    def _flush_log(self):
+        if self._log_buffer:
+            self.log_box.append("\n".join(self._log_buffer))
+            self._log_buffer.clear()
 
     # =================================================
     # LOGGING SYSTEM
     # =================================================
     def setup_logging(self):
         """Setup file-based logging system"""
+        self._logger = logging.getLogger("eru")
         try:
             # Create logs directory if it doesn't exist
             if not os.path.exists("logs"):
@@ -1033,14 +1315,20 @@ class EmailApp(QWidget):
             # Setup logging configuration
             log_file = os.path.join("logs", f"email_sender_{datetime.now().strftime('%Y%m%d')}.log")
             
+            # Records are queued on the GUI thread and written by a listener thread
+            log_queue = queue.Queue()
+            self._log_listener = QueueListener(
+                log_queue,
+                logging.FileHandler(log_file, encoding='utf-8'),
+                logging.StreamHandler()  # Also log to console
+            )
             logging.basicConfig(
                 level=logging.INFO,
                 format='%(asctime)s - %(levelname)s - %(message)s',
-                handlers=[
-                    logging.FileHandler(log_file, encoding='utf-8'),
-                    logging.StreamHandler()  # Also log to console
-                ]
+                handlers=[QueueHandler(log_queue)]
             )
+            self._log_listener.start()
+            QApplication.instance().aboutToQuit.connect(self._log_listener.stop)
             
             # Log application start
             logging.info("Eru Email Sender Pro started")
@@ -1056,16 +1344,19 @@ class EmailApp(QWidget):
     # TEXT FORMATTING
     # =================================================
     def make_bold(self):
+        self._ensure_composer_built()
         fmt = self.email_editor.currentCharFormat()
         fmt.setFontWeight(QFont.Bold if fmt.fontWeight() != QFont.Bold else QFont.Normal)
         self.email_editor.setCurrentCharFormat(fmt)
 
     def make_italic(self):
+        self._ensure_composer_built()
         fmt = self.email_editor.currentCharFormat()
         fmt.setFontItalic(not fmt.fontItalic())
         self.email_editor.setCurrentCharFormat(fmt)
 
     def make_underline(self):
+        self._ensure_composer_built()
         fmt = self.email_editor.currentCharFormat()
         fmt.setFontUnderline(not fmt.fontUnderline())
         self.email_editor.setCurrentCharFormat(fmt)
@@ -1075,58 +1366,67 @@ class EmailApp(QWidget):
     # =================================================
     def preview_email(self):
         """Preview email with sample data"""
+        self._ensure_composer_built()
+        
+        # The dialog is built once and reused on later previews
+        if self._preview_dialog is None:
+            self._preview_dialog = self._create_preview_dialog()
+        
+        self._refresh_preview_samples()
+        self.update_preview()  # Refresh with the current subject/body
+        self._preview_dialog.exec()
+
+    def _refresh_preview_samples(self):
+        """Offer the loaded recipients as preview samples; rebuilt only when the data changes"""
+        if self._preview_samples_source is self.df and self.sample_combo.count():
+            return
+        self._preview_samples_source = self.df
+        names = []
+        if self.df is not None:
+            full_names = self.df["Full Name"].astype(str).str.strip()
+            names = full_names[full_names != ""].drop_duplicates().head(self.PREVIEW_SAMPLE_LIMIT).tolist()
+        with QSignalBlocker(self.sample_combo):
+            self.sample_combo.clear()
+            if names:
+                for name in names:
+                    self.sample_combo.addItem(f"Recipient: {name}", name)
+            else:
+                # No data loaded yet; fall back to made-up samples
+                for name in ("Dela Cruz, Juan", "Smith, John", "Garcia, Maria"):
+                    self.sample_combo.addItem(f"Sample: {name}", name)
+
+    def _create_preview_dialog(self):
         from PySide6.QtWidgets import QDialog, QVBoxLayout, QTextBrowser, QHBoxLayout, QLabel, QComboBox
         
         # Create preview dialog
         dialog = QDialog(self)
         dialog.setWindowTitle("📧 Email Preview")
         dialog.setMinimumSize(800, 600)
-        dialog.setStyleSheet(self.modern_styles())
+        # No setStyleSheet here: the window's sheet already cascades to this child
         
         layout = QVBoxLayout(dialog)
         
         # Sample recipient selection
         sample_row = QHBoxLayout()
         sample_label = QLabel("Sample Recipient:")
-        sample_combo = QComboBox()
-        sample_combo.addItem("Sample: Dela Cruz, Juan", "Dela Cruz, Juan")
-        sample_combo.addItem("Sample: Smith, John", "Smith, John")
-        sample_combo.addItem("Sample: Garcia, Maria", "Garcia, Maria")
+        self.sample_combo = QComboBox()  # Filled by _refresh_preview_samples()
         sample_row.addWidget(sample_label)
-        sample_row.addWidget(sample_combo)
+        sample_row.addWidget(self.sample_combo)
         sample_row.addStretch()
         layout.addLayout(sample_row)
         
         # Preview browser
-        preview_browser = QTextBrowser()
-        preview_browser.setObjectName("previewBrowser")
-        layout.addWidget(preview_browser)
-        
-        # Update preview when sample changes
-        def update_preview():
-            sample_name = sample_combo.currentData()
-            subject = self.subject_input.text().replace("{{fullname}}", sample_name)
-            body_html = self.email_editor.toHtml().replace("{{fullname}}", get_surname(sample_name))
-            
-            # Apply Outlook-safe formatting
-            try:
-                spacing_px = int(self.spacing_select.currentData())
-                final_html = build_outlook_safe_html(body_html, spacing_px)
-            except Exception:
-                final_html = body_html
-            
-            preview_html = f"""
-            <div style="font-family: Segoe UI, Arial, sans-serif; padding: 20px;">
-                <h3 style="color: #1e40af; margin-bottom: 15px;">Subject: {subject}</h3>
-                <div style="border-top: 1px solid #e2e8f0; padding-top: 15px;">
-                    {final_html}
-                </div>
-            </div>
-            """
-            preview_browser.setHtml(preview_html)
-        
-        sample_combo.currentIndexChanged.connect(lambda: update_preview())
-        update_preview()  # Initial preview
+        self.preview_browser = QTextBrowser()
+        self.preview_browser.setObjectName("previewBrowser")
+        # One document for the dialog's lifetime; sample changes edit it in place
+        self._preview_doc = QTextDocument(self.preview_browser)
+        self._preview_doc.setUndoRedoEnabled(False)
+        self._preview_doc.setDefaultFont(self.preview_browser.font())
+        self.preview_browser.setDocument(self._preview_doc)
+        layout.addWidget(self.preview_browser)
+        
+        # Only the names change when the sample changes
+        self.sample_combo.currentIndexChanged.connect(lambda: self.update_preview_names())
         
         # Dialog buttons
         from PySide6.QtWidgets import QDialogButtonBox
@@ -1134,98 +1434,163 @@ class EmailApp(QWidget):
         buttons.rejected.connect(dialog.close)
         layout.addWidget(buttons)
         
-        dialog.exec()
+        return dialog
+
+    def update_preview(self):
+        """Parse the current subject/body into the preview once, then fill in the sample name"""
+        subject = self.subject_input.text()
+        body_html = self.email_editor.toHtml()
+        preview_html = self._preview_html(subject, body_html)
+        doc = self._preview_doc
+        doc.setHtml(preview_html)
+        if "{{fullname}}" not in preview_html:
+            # Nothing to personalize: skip the document search, and sample changes become no-ops
+            self._preview_names = ([], 0)
+            return
+        
+        # Select every placeholder; the cursors keep tracking their text through later edits
+        cursors = []
+        cursor = doc.find("{{fullname}}")
+        while not cursor.isNull():
+            cursors.append(cursor)
+            cursor = doc.find("{{fullname}}", cursor)
+        if len(cursors) == preview_html.count("{{fullname}}"):
+            # Subject placeholders come first in the document
+            self._preview_names = (cursors, subject.count("{{fullname}}"))
+        else:
+            # A placeholder split by markup is only replaced in the raw HTML, as
+            # when sending; re-render the substituted HTML instead
+            self._preview_names = None
+            self._preview_source = (subject, body_html)
+        self.update_preview_names()
+
+    def update_preview_names(self):
+        """Show the selected sample recipient's name in the preview"""
+        sample_name = self.sample_combo.currentData()
+        surname = get_surname(sample_name)
+        if self._preview_names is None:
+            subject, body_html = self._preview_source
+            self._preview_doc.setHtml(self._preview_html(
+                fill_placeholders(subject, {"fullname": sample_name}),
+                fill_placeholders(body_html, {"fullname": surname}),
+            ))
+            return
+        cursors, subject_count = self._preview_names
+        for i, cursor in enumerate(cursors):
+            start = cursor.selectionStart()
+            cursor.insertText(sample_name if i < subject_count else surname)
+            cursor.setPosition(start, QTextCursor.KeepAnchor)  # Reselect for the next swap
+
+    def _preview_html(self, subject, body_html):
+        """Wrap the subject and the Outlook-safe body in the preview layout"""
+        # Apply Outlook-safe formatting
+        try:
+            spacing_px = int(self.spacing_select.currentData())
+            final_html = build_outlook_safe_html(body_html, spacing_px)
+        except Exception:
+            final_html = body_html
+        
+        return _PREVIEW_TMPL.substitute(subject=subject, final_html=final_html)
 
     # =================================================
     # COMPOSER SPACING PREVIEW
     # =================================================
     def apply_editor_paragraph_spacing(self, px: int):
-        doc = self.email_editor.document()
-        cursor = QTextCursor(doc)
-        cursor.beginEditBlock()
-        block = doc.begin()
-        while block.isValid():
-            bfmt = block.blockFormat()
+        px = max(0, int(px))
+        if self._spacing_format is None or self._spacing_format[0] != px:
+            bfmt = QTextBlockFormat()
             bfmt.setTopMargin(0)
-            bfmt.setBottomMargin(max(0, int(px)))
+            bfmt.setBottomMargin(px)
             # Use proportional line height ~135% for readability
             try:
                 bfmt.setLineHeight(135, QTextBlockFormat.ProportionalHeight)
             except Exception:
                 pass
-            c = QTextCursor(block)
-            c.setBlockFormat(bfmt)
-            block = block.next()
-        cursor.endEditBlock()
+            # Same spacing as CSS so HTML set or pasted later is parsed with it
+            css = f"p, li {{ margin-top: 0px; margin-bottom: {px}px; line-height: 135%; }}"
+            self._spacing_format = (px, bfmt, css)
+        doc = self.email_editor.document()
+        doc.setDefaultStyleSheet(self._spacing_format[2])
+        # Merge into every block at once; other block properties are kept
+        cursor = QTextCursor(doc)
+        cursor.select(QTextCursor.Document)
+        cursor.mergeBlockFormat(self._spacing_format[1])
 
     def on_spacing_changed(self, _index: int):
+        self._spacing_timer.start()  # Restarts on every change in a burst
+
+    def _commit_spacing(self):
         try:
             px = int(self.spacing_select.currentData())
         except Exception:
             px = 12
         self.apply_editor_paragraph_spacing(px)
-        self.settings.set("paragraph_spacing", px)
+        self.settings.set(_SK_SPACING, px)
 
     # =================================================
     # TEMPLATE MANAGEMENT
     # =================================================
+    def _templates_read(self):
+        """Return the saved templates (name -> {subject, body})"""
+        return self._templates_cache
+
+    def _templates_write(self, templates):
+        """Replace the saved templates and persist them"""
+        self._templates_cache = templates
+        self.settings.set(_SK_TEMPLATES, templates)
+
     def load_templates(self):
         """Load templates from settings into combo box"""
-        templates = self.settings.get("email_templates", {})
-        
-        # Clear existing items except default
-        self.template_combo.clear()
-        self.template_combo.addItem("Default HR Notice", "default")
-        
-        # Add saved templates
-        for name in templates.keys():
-            self.template_combo.addItem(name, name)
-        
-        # Restore last selected template
-        last_template = self.settings.get("last_selected_template", "default")
-        
-        template_found = False
-        for i in range(self.template_combo.count()):
-            item_data = self.template_combo.itemData(i)
-            if item_data == last_template:
-                # Temporarily block signals to avoid triggering load_template twice
-                self.template_combo.blockSignals(True)
-                self.template_combo.setCurrentIndex(i)
-                self.template_combo.blockSignals(False)
-                # Load the template content directly without signal
-                self._load_template_content(i)
-                template_found = True
-                break
-        
-        if not template_found:
-            # Default template is already selected at index 0
-            self._load_template_content(0)
+        templates = self._templates_read()
+        last_template = self.settings.get(_SK_LAST_TEMPLATE, _DEFAULT_TEMPLATE_KEY)
+        
+        # Rebuild and reselect without firing load_template(): clearing the combo
+        # would otherwise record "no template" as the last selection
+        with QSignalBlocker(self.template_combo):
+            # Fill a fresh model off-screen and swap it in once, rather than
+            # notifying the combo's view for every added item
+            model = QStandardItemModel(self.template_combo)  # Combo deletes the old one
+            self._template_index = {}
+            rows = [("Default HR Notice", _DEFAULT_TEMPLATE_KEY)] + [(name, name) for name in templates]
+            for label, key in rows:
+                item = QStandardItem(label)
+                item.setData(key, Qt.UserRole)
+                self._template_index[key] = model.rowCount()
+                model.appendRow(item)
+            self.template_combo.setModel(model)
+            
+            # Restore last selected template; default is already at index 0
+            i = self._template_index.get(last_template)
+            if i is None:
+                i, last_template = 0, _DEFAULT_TEMPLATE_KEY
+            self.template_combo.setCurrentIndex(i)
+        
+        # Load the template content directly without signal
+        self._load_template_content(i, last_template)
     
-    def _load_template_content(self, index):
+    def _load_template_content(self, index, template_name=None):
         """Load template content without saving the last selected template"""
         if index == 0:  # Default template
-            self.subject_input.setText("NOTICE TO SUBMIT LACKING EMPLOYMENT REQUIREMENTS - {{fullname}}")
-            default_body = """
-<p>Dear {{fullname}},</p>
-
-<p>This is to formally inform you that you still have outstanding mandatory employment requirements as of this date, despite prior reminders and your signed Affidavit of Undertaking upon commencement of employment.</p>
-
-<p>As stated in your Affidavit of Undertaking, you committed to submit all required documents within prescribed period. <b>You are hereby given five (5) days from receipt of this email notice </b> to complete and submit pending requirements. Please see the attached <b>Notice of Incomplete Employment Requirements</b> for full details. Failure to comply within the given timeframe, may result in appropriate administrative action in accordance with Company policy.</p>
-
-<p>Please submit the required documents through this same email thread. For any clarification, please coordinate with <b>HR-DMRC or your assigned account supervisor.</b></p>
-
-<p>Thanks,<br>Jhudel S. Orola<br>HR Staff - Data Management & Records Control<br>Acabar Marketing International Inc.<br>(02) 8887-8170 Local 153</p>
-
-<p><img class="x_CToWUd" height="77" width="250" src="https://ci3.googleusercontent.com/mail-sig/AIorK4x0oCXqeBBsjR9hQB3HLxhAJPc1msod_2dqrIiATYz-sDfATgJdOa_R6eWlr16--ykbMmeApG_G3we-" data-imagetype="External"></p>
-"""
-            self.email_editor.setHtml(default_body)
+            loaded = (_DEFAULT_TEMPLATE_KEY, _DEFAULT_SUBJECT, _DEFAULT_BODY_HTML)
         else:
-            template_name = self.template_combo.itemData(index)  # Use index instead of currentData
-            templates = self.settings.get("email_templates", {})
-            if template_name in templates:
-                template = templates[template_name]
-                self.subject_input.setText(template.get("subject", ""))
-                self.email_editor.setHtml(template.get("body", ""))
+            if template_name is None:
+                template_name = self.template_combo.itemData(index)  # Use index instead of currentData
+            templates = self._templates_read()
+            if template_name not in templates:
+                return
+            template = templates[template_name]
+            loaded = (template_name, template.get(_TPL_SUBJECT, ""), template.get(_TPL_BODY, ""))
+        
+        if self.subject_input.text() != loaded[1]:
+            self.subject_input.setText(loaded[1])
+        # Rebuild the document only if it differs from what was last loaded and
+        # hasn't been edited since
+        if loaded != self._loaded_template or self.email_editor.document().isModified():
+            if index == 0:
+                self._load_default_body()
+            else:
+                self.email_editor.setHtml(loaded[2])
+            self._loaded_template = loaded
         
         # Apply current spacing
         try:
@@ -1233,18 +1598,39 @@ class EmailApp(QWidget):
             self.apply_editor_paragraph_spacing(px)
         except Exception:
             pass
+        self.email_editor.document().setModified(False)  # Baseline for the check above
+
+    def _load_default_body(self):
+        """Show the default body, cloned from the pre-parsed document"""
+        body_doc = default_body_document(self.email_editor)
+        body_doc.setDefaultFont(self.email_editor.font())  # setDocument() keeps the doc's own font
+        # Qt frees the editor's built-in document on replacement, but not an
+        # earlier clone (owned by the editor itself), so release that one here
+        previous = self.email_editor.document()
+        stale_clone = previous if previous.parent() is self.email_editor else None
+        self.email_editor.setDocument(body_doc)
+        if stale_clone is not None:
+            stale_clone.deleteLater()
 
     def load_template(self, index):
         """Load selected template into editor"""
-        # Load the content
-        self._load_template_content(index)
+        # Look the name up once for both the load and the saved selection
+        template_name = self.template_combo.itemData(index)
+        self._load_template_content(index, template_name)
         
         # Save the last selected template
-        template_name = self.template_combo.currentData()
-        self.settings.set("last_selected_template", template_name)
+        self.settings.set(_SK_LAST_TEMPLATE, template_name)
     
+    def _notify(self, title, text):
+        """Show an information box without blocking the event loop"""
+        box = QMessageBox(QMessageBox.Information, title, text, QMessageBox.Ok, self)
+        box.setWindowModality(Qt.NonModal)
+        box.setAttribute(Qt.WA_DeleteOnClose)  # The window owns it until it is closed
+        box.show()
+
     def save_template(self):
         """Save current email as template"""
+        self._ensure_composer_built()
         from PySide6.QtWidgets import QInputDialog
         
         name, ok = QInputDialog.getText(self, "Save Template", "Enter template name:")
@@ -1252,25 +1638,25 @@ class EmailApp(QWidget):
             return
         
         name = name.strip()
-        templates = self.settings.get("email_templates", {})
+        templates = self._templates_read()
         templates[name] = {
-            "subject": self.subject_input.text(),
-            "body": self.email_editor.toHtml()
+            _TPL_SUBJECT: self.subject_input.text(),
+            _TPL_BODY: _strip_qt_style(self.email_editor.toHtml())
         }
         
-        self.settings.set("email_templates", templates)
+        self._templates_write(templates)
         self.load_templates()  # Refresh combo box
         
         # Select the newly saved template
-        for i in range(self.template_combo.count()):
-            if self.template_combo.itemData(i) == name:
-                self.template_combo.setCurrentIndex(i)
-                break
+        i = self._template_index.get(name)
+        if i is not None:
+            self.template_combo.setCurrentIndex(i)
         
-        QMessageBox.information(self, "Success", f"Template '{name}' saved successfully.")
+        self._notify("Success", f"Template '{name}' saved successfully.")
     
     def delete_template(self):
         """Delete selected template"""
+        self._ensure_composer_built()
         if self.template_combo.currentIndex() == 0:
             QMessageBox.warning(self, "Warning", "Cannot delete the default template.")
             return
@@ -1281,413 +1667,33 @@ class EmailApp(QWidget):
                                    QMessageBox.Yes | QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            templates = self.settings.get("email_templates", {})
+            templates = self._templates_read()
             if template_name in templates:
                 del templates[template_name]
-                self.settings.set("email_templates", templates)
-                self.load_templates()  # Refresh combo box
-                self.template_combo.setCurrentIndex(0)  # Select default
-                QMessageBox.information(self, "Success", f"Template '{template_name}' deleted.")
+                self._templates_write(templates)
+                # load_templates() reselects under a signal blocker, so record the fallback here
+                self.settings.set(_SK_LAST_TEMPLATE, _DEFAULT_TEMPLATE_KEY)
+                self.load_templates()  # Refresh combo box and select default
+                self._notify("Success", f"Template '{template_name}' deleted.")
 
     # =================================================
     # KEYBOARD SHORTCUTS
     # =================================================
     def setup_keyboard_shortcuts(self):
         """Setup keyboard shortcuts for common actions"""
-        
-        # Export Template: Ctrl+E
-        export_shortcut = QAction(self)
-        export_shortcut.setShortcut(QKeySequence("Ctrl+E"))
-        export_shortcut.triggered.connect(self.export_template)
-        self.addAction(export_shortcut)
-        
-        # Load Excel: Ctrl+O
-        load_shortcut = QAction(self)
-        load_shortcut.setShortcut(QKeySequence("Ctrl+O"))
-        load_shortcut.triggered.connect(self.load_excel)
-        self.addAction(load_shortcut)
-        
-        # Start Sending: Ctrl+S
-        start_shortcut = QAction(self)
-        start_shortcut.setShortcut(QKeySequence("Ctrl+S"))
-        start_shortcut.triggered.connect(self.start_sending)
-        self.addAction(start_shortcut)
-        
-        # Stop Sending: Ctrl+Shift+S
-        stop_shortcut = QAction(self)
-        stop_shortcut.setShortcut(QKeySequence("Ctrl+Shift+S"))
-        stop_shortcut.triggered.connect(self.stop_sending)
-        self.addAction(stop_shortcut)
-        
-        # Preview Email: Ctrl+P
-        preview_shortcut = QAction(self)
-        preview_shortcut.setShortcut(QKeySequence("Ctrl+P"))
-        preview_shortcut.triggered.connect(self.preview_email)
-        self.addAction(preview_shortcut)
-        
-        # Save Template: Ctrl+T
-        save_template_shortcut = QAction(self)
-        save_template_shortcut.setShortcut(QKeySequence("Ctrl+T"))
-        save_template_shortcut.triggered.connect(self.save_template)
-        self.addAction(save_template_shortcut)
-        
-        # Bold: Ctrl+B
-        bold_shortcut = QAction(self)
-        bold_shortcut.setShortcut(QKeySequence("Ctrl+B"))
-        bold_shortcut.triggered.connect(self.make_bold)
-        self.addAction(bold_shortcut)
-        
-        # Italic: Ctrl+I
-        italic_shortcut = QAction(self)
-        italic_shortcut.setShortcut(QKeySequence("Ctrl+I"))
-        italic_shortcut.triggered.connect(self.make_italic)
-        self.addAction(italic_shortcut)
-        
-        # Underline: Ctrl+U
-        underline_shortcut = QAction(self)
-        underline_shortcut.setShortcut(QKeySequence("Ctrl+U"))
-        underline_shortcut.triggered.connect(self.make_underline)
-        self.addAction(underline_shortcut)
+        # Actions are parented to the window, which keeps them alive
+        for sequence, handler in self._SHORTCUTS:
+            action = QAction(self)
+            action.setShortcut(QKeySequence(sequence))
+            action.triggered.connect(getattr(self, handler))
+            self.addAction(action)
 
     # =================================================
     # MODERN STYLES
     # =================================================
-    def modern_styles(self):
-        return """
-        /* =============================================
-           GLOBAL STYLES
-           ============================================= */
-        QWidget {
-            background-color: #f8fafc;
-            color: #1e293b;
-            font-family: 'Segoe UI', -apple-system, BlinkMacSystemFont, 'Helvetica Neue', Arial, sans-serif;
-            font-size: 11pt;
-        }
-        
-        /* =============================================
-           HEADER STYLES
-           ============================================= */
-        #headerTitle {
-            font-size: 24pt;
-            font-weight: 600;
-            color: #1e40af;
-            margin: 10px 0;
-        }
-        
-        #headerSubtitle {
-            font-size: 12pt;
-            color: #64748b;
-            margin-bottom: 10px;
-        }
-        
-        /* =============================================
-           CONTROLS FRAME
-           ============================================= */
-        #controlsFrame {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 #ffffff, stop:1 #f1f5f9);
-            border: 1px solid #e2e8f0;
-            border-radius: 12px;
-            margin: 5px 0;
-        }
-        
-        /* =============================================
-           BUTTON STYLES
-           ============================================= */
-        QPushButton {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 #3b82f6, stop:1 #2563eb);
-            color: white;
-            border: none;
-            border-radius: 8px;
-            padding: 12px 24px;
-            font-weight: 500;
-            font-size: 11pt;
-            min-width: 120px;
-        }
-        
-        QPushButton:hover {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 #60a5fa, stop:1 #3b82f6);
-        }
-        
-        QPushButton:pressed {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 #2563eb, stop:1 #1d4ed8);
-        }
-        
-        QPushButton:disabled {
-            background: #e2e8f0;
-            color: #94a3b8;
-        }
-        
-        #primaryButton {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 #6366f1, stop:1 #4f46e5);
-        }
-        
-        #primaryButton:hover {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 #818cf8, stop:1 #6366f1);
-        }
-        
-        #successButton {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 #10b981, stop:1 #059669);
-        }
-        
-        #successButton:hover {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 #34d399, stop:1 #10b981);
-        }
-        
-        #dangerButton {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 #ef4444, stop:1 #dc2626);
-        }
-        
-        #dangerButton:hover {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 #f87171, stop:1 #ef4444);
-        }
-        
-        #secondaryButton {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 #64748b, stop:1 #475569);
-        }
-        
-        #secondaryButton:hover {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 #94a3b8, stop:1 #64748b);
-        }
-        
-        /* =============================================
-           SECTION TITLES
-           ============================================= */
-        #sectionTitle {
-            font-size: 14pt;
-            font-weight: 600;
-            color: #1e40af;
-            margin: 5px 0;
-            padding: 8px 0;
-            border-bottom: 2px solid #e2e8f0;
-        }
-        
-        /* =============================================
-           FRAME STYLES
-           ============================================= */
-        #tableFrame, #emailFrame, #statusFrame {
-            background: white;
-            border: 1px solid #e2e8f0;
-            border-radius: 12px;
-            padding: 15px;
-        }
-        
-        /* =============================================
-           INPUT STYLES
-           ============================================= */
-        QLineEdit, QTextEdit, QComboBox {
-            background: white;
-            border: 2px solid #e2e8f0;
-            border-radius: 8px;
-            padding: 10px;
-            font-size: 11pt;
-        }
-        
-        QLineEdit:focus, QTextEdit:focus, QComboBox:focus {
-            border: 2px solid #3b82f6;
-        }
-        
-        /* =============================================
-           TABLE STYLES
-           ============================================= */
-        QTableWidget {
-            background: white;
-            border: 1px solid #e2e8f0;
-            border-radius: 8px;
-            gridline-color: #f1f5f9;
-            selection-background-color: #3b82f6;
-            alternate-background-color: #f8fafc;
-        }
-        
-        QTableWidget::item {
-            padding: 10px;
-            border-bottom: 1px solid #f1f5f9;
-        }
-        
-        QTableWidget::item:selected {
-            background: #3b82f6;
-            color: white;
-        }
-        
-        QHeaderView::section {
-            background: #f8fafc;
-            color: #374151;
-            padding: 12px;
-            border: none;
-            border-right: 1px solid #e2e8f0;
-            border-bottom: 2px solid #e2e8f0;
-            font-weight: 600;
-        }
-        
-        /* =============================================
-           PROGRESS BAR
-           ============================================= */
-        QProgressBar {
-            background: #f1f5f9;
-            border: 1px solid #e2e8f0;
-            border-radius: 8px;
-            text-align: center;
-            color: #374151;
-            font-weight: 600;
-            height: 24px;
-        }
-        
-        QProgressBar::chunk {
-            background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                stop:0 #10b981, stop:1 #059669);
-            border-radius: 6px;
-            margin: 2px;
-        }
-        
-        /* =============================================
-           GROUP BOX
-           ============================================= */
-        QGroupBox {
-            background: #f8fafc;
-            border: 1px solid #e2e8f0;
-            border-radius: 8px;
-            margin-top: 10px;
-            padding-top: 20px;
-            font-weight: 600;
-            color: #374151;
-        }
-        
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            left: 10px;
-            padding: 0 5px;
-        }
-        
-        /* =============================================
-           COMBO BOX
-           ============================================= */
-        QComboBox::drop-down {
-            border: none;
-            width: 20px;
-        }
-        
-        QComboBox::down-arrow {
-            image: none;
-            border-left: 5px solid transparent;
-            border-right: 5px solid transparent;
-            border-top: 5px solid #64748b;
-        }
-        
-        QComboBox QAbstractItemView {
-            background: white;
-            border: 1px solid #e2e8f0;
-            selection-background-color: #3b82f6;
-            color: #374151;
-        }
-        
-        /* =============================================
-           SCROLLBAR
-           ============================================= */
-        QScrollBar:vertical {
-            background: #f1f5f9;
-            border: none;
-            border-radius: 6px;
-            width: 12px;
-        }
-        
-        QScrollBar::handle:vertical {
-            background: #cbd5e1;
-            border-radius: 6px;
-            min-height: 20px;
-        }
-        
-        QScrollBar::handle:vertical:hover {
-            background: #94a3b8;
-        }
-        
-        /* =============================================
-           SPECIAL ELEMENTS
-           ============================================= */
-        #recipientCounter {
-            background: #eff6ff;
-            color: #1d4ed8;
-            border: 1px solid #3b82f6;
-            border-radius: 20px;
-            padding: 6px 12px;
-            font-weight: 600;
-            font-size: 10pt;
-        }
-        
-        #templateCombo, #spacingSelect {
-            background: #f8fafc;
-            border: 2px solid #3b82f6;
-        }
-        
-        #subjectInput {
-            background: #eff6ff;
-            border: 2px solid #3b82f6;
-            font-weight: 500;
-        }
-        
-        #emailEditor {
-            background: white;
-            border: 2px solid #e2e8f0;
-            font-family: 'Segoe UI', system-ui, sans-serif;
-            line-height: 1.5;
-        }
-        
-        #logBox {
-            background: #1e293b;
-            color: #e2e8f0;
-            border: 2px solid #334155;
-            font-family: 'Consolas', 'Monaco', monospace;
-            font-size: 10pt;
-        }
-        
-        /* =============================================
-           TAB WIDGET STYLING
-           ============================================= */
-        QTabWidget::pane {
-            border: 1px solid #e2e8f0;
-            background: white;
-            border-radius: 8px;
-            top: -1px;
-        }
-        
-        QTabBar::tab {
-            background: #f8fafc;
-            border: 1px solid #e2e8f0;
-            padding: 12px 24px;
-            margin-right: 2px;
-            border-top-left-radius: 8px;
-            border-top-right-radius: 8px;
-            font-weight: 500;
-            font-size: 11pt;
-            color: #64748b;
-        }
-        
-        QTabBar::tab:selected {
-            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                stop:0 #3b82f6, stop:1 #2563eb);
-            color: white;
-            border-bottom: 2px solid #2563eb;
-        }
-        
-        QTabBar::tab:hover:!selected {
-            background: #e2e8f0;
-            color: #1e40af;
-        }
-        
-        #mainTabWidget QTabBar::tab {
-            min-width: 150px;
-        }
-        """
+    @staticmethod
+    def modern_styles():
+        return _load_modern_qss()
 
 # =====================================================
 # RUN APPLICATION